@@ -1,7 +1,13 @@
-import base64
 import array
+from dataclasses import dataclass, field
+import numpy as np
 from config import Config
 
+try:
+    import pybase64 as base64  # SIMD-accelerated drop-in (libbase64)
+except ImportError:
+    import base64
+
 try:
     import audioop
 except ImportError:
@@ -10,6 +16,154 @@ except ImportError:
     except ImportError:
         raise ImportError("Could not import audioop. For Python 3.13+, please install 'audioop-lts'")
 
+try:
+    from numba import njit as _njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Use the vectorized NumPy μ-law codec (set False to fall back to audioop for A/B testing)
+USE_NUMPY = True
+
+# Config values bound once at import - the hot methods run on a 20ms cadence
+# and a class-attribute lookup per call adds up across streams
+_SW = Config.PCM_SAMPLE_WIDTH
+_TWILIO_SR = Config.TWILIO_SAMPLE_RATE
+_GEMINI_SR = Config.GEMINI_SAMPLE_RATE
+
+def _build_ulaw2lin_table() -> 'np.ndarray':
+    """Build the 256-entry μ-law → 16-bit PCM lookup table (G.711, matches audioop)"""
+    table = np.empty(256, dtype=np.int16)
+    for i in range(256):
+        u = ~i & 0xFF
+        exponent = (u >> 4) & 0x07
+        mantissa = u & 0x0F
+        magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+        table[i] = -magnitude if (u & 0x80) else magnitude
+    return table
+
+# μ-law decode LUT, built once at import
+_ULAW2LIN = _build_ulaw2lin_table()
+
+# Segment LUT for encode: segment number for (biased 14-bit value >> 5), 0..256
+_ULAW_SEG = np.array(
+    [max(i.bit_length() - 1, 0) for i in range(257)],
+    dtype=np.int32
+)
+
+# Fixed-ratio resampler filters (Kaiser-windowed sinc, ~16 zero crossings)
+_RESAMPLE_NUM_ZEROS = 16
+_RESAMPLE_KAISER_BETA = 8.6
+
+def _design_resample_filter(up: int, down: int) -> 'np.ndarray':
+    """Design a lowpass FIR prototype for an integer-ratio resampler"""
+    max_rate = max(up, down)
+    half = _RESAMPLE_NUM_ZEROS * max_rate
+    n = np.arange(-half, half + 1)
+    h = np.sinc(n / max_rate) * (up / max_rate)
+    h *= np.kaiser(h.size, _RESAMPLE_KAISER_BETA)
+    return h
+
+# The three ratios this service ever needs: 8k→16k up, 16k→8k and 24k→8k down
+_RESAMPLE_FILTERS = {
+    (8000, 16000): (2, 1, _design_resample_filter(2, 1)),
+    (16000, 8000): (1, 2, _design_resample_filter(1, 2)),
+    (24000, 8000): (1, 3, _design_resample_filter(1, 3)),
+}
+
+def _fused_ulaw_resample2x(mulaw, h, lut, out):
+    """Fused μ-law decode + 2x upsample loop kernel (JIT-compiled under Numba)"""
+    n = mulaw.shape[0]
+    taps = h.shape[0]
+    delay = (taps - 1) // 2
+    x = np.empty(n, np.float64)
+    for i in range(n):
+        x[i] = lut[mulaw[i]]
+    for m in range(2 * n):
+        t = m + delay
+        k_min = max(0, (t - taps + 2) // 2)
+        k_max = min(t // 2, n - 1)
+        acc = 0.0
+        for k in range(k_min, k_max + 1):
+            acc += h[t - 2 * k] * x[k]
+        if acc > 32767.0:
+            acc = 32767.0
+        elif acc < -32768.0:
+            acc = -32768.0
+        out[m] = np.int16(acc)
+
+if _HAS_NUMBA:
+    _fused_ulaw_resample2x = _njit(cache=True, boundscheck=False)(_fused_ulaw_resample2x)
+
+class StreamResampler:
+    """
+    Stateful fixed-ratio resampler that carries FIR history across frames
+
+    The stateless per-frame path restarts the filter from zero on every
+    20 ms frame, which wastes startup work and puts a small discontinuity
+    at each frame boundary. One instance per stream direction keeps the
+    input tail needed by the filter and emits seamless, gap-free output.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int):
+        self._identity = from_rate == to_rate
+        if self._identity:
+            return
+        self._up, self._down, self._h = _RESAMPLE_FILTERS[(from_rate, to_rate)]
+        self._taps = self._h.size
+        self._delay = (self._taps - 1) // 2
+        self._buf = np.zeros(0, np.float64)  # retained input tail
+        self._in_base = 0   # absolute index of _buf[0]
+        self._out_count = 0  # outputs emitted so far
+
+    def process(self, samples: 'np.ndarray') -> 'np.ndarray':
+        """Resample one block of int16 samples, continuing from prior blocks"""
+        if self._identity:
+            return samples
+
+        up, down, h = self._up, self._down, self._h
+        self._buf = np.concatenate((self._buf, samples.astype(np.float64)))
+        total_in = self._in_base + self._buf.size
+
+        # Last output index whose inputs are fully available
+        m_max = ((total_in - 1) * up - self._delay) // down
+        if m_max < self._out_count:
+            return np.zeros(0, np.int16)
+
+        if up > 1:
+            xs = np.zeros(self._buf.size * up)
+            xs[::up] = self._buf
+        else:
+            xs = self._buf
+
+        y = np.convolve(xs, h)
+
+        # Map absolute output indices onto the local convolution
+        m = np.arange(self._out_count, m_max + 1)
+        c = m * down + self._delay - up * self._in_base
+        out = y[c]
+        np.clip(out, -32768, 32767, out=out)
+        self._out_count = m_max + 1
+
+        # Trim input no longer needed by future outputs
+        t_next = self._out_count * down + self._delay
+        keep_from = max(0, (t_next - self._taps + 1) // up)
+        if keep_from > self._in_base:
+            self._buf = self._buf[keep_from - self._in_base:]
+            self._in_base = keep_from
+
+        return out.astype(np.int16)
+
+
+@dataclass
+class AudioScratch:
+    """
+    Preallocated per-session work buffers, reused across frames so the
+    per-frame decode path stops churning small allocations
+    """
+    pcm8k: 'np.ndarray' = field(default_factory=lambda: np.empty(4096, np.int16))
+    pcm16k: 'np.ndarray' = field(default_factory=lambda: np.empty(8192, np.int16))
+
 class AudioConverter:
     """Handle audio format conversions between Twilio (μ-law) and Gemini (PCM)"""
     
@@ -24,8 +178,11 @@ class AudioConverter:
         Returns:
             PCM audio bytes (16-bit, 8kHz)
         """
+        if USE_NUMPY:
+            # Here it Decode μ-law via vectorized LUT (one table gather in C)
+            return _ULAW2LIN[np.frombuffer(mulaw_data, np.uint8)].tobytes()
         # Here it Decode μ-law to linear PCM (16-bit)
-        pcm_data = audioop.ulaw2lin(mulaw_data, Config.PCM_SAMPLE_WIDTH)
+        pcm_data = audioop.ulaw2lin(mulaw_data, _SW)
         return pcm_data
     
     @staticmethod
@@ -39,8 +196,21 @@ class AudioConverter:
         Returns:
             μ-law encoded audio bytes
         """
+        if USE_NUMPY:
+            # Here it Encode linear PCM to μ-law with branchless NumPy bit math
+            # (14-bit domain with clip 8159 / bias 0x21, bit-exact with audioop)
+            pcm = np.frombuffer(pcm_data, dtype='<i2').astype(np.int32) >> 2
+            mask = np.where(pcm < 0, 0x7F, 0xFF)
+            val = np.minimum(np.abs(pcm), 8159) + 0x21
+            seg = _ULAW_SEG[val >> 5]
+            uval = np.where(
+                seg >= 8,
+                0x7F,
+                (seg << 4) | ((val >> (seg + 1)) & 0x0F)
+            )
+            return (uval ^ mask).astype(np.uint8).tobytes()
         # Here it Encode linear PCM to μ-law
-        mulaw_data = audioop.lin2ulaw(pcm_data, Config.PCM_SAMPLE_WIDTH)
+        mulaw_data = audioop.lin2ulaw(pcm_data, _SW)
         return mulaw_data
     
     @staticmethod
@@ -58,18 +228,63 @@ class AudioConverter:
         """
         if from_rate == to_rate:
             return audio_data
-        
-        # Here it Use audioop.ratecv for resampling
+
+        if (from_rate, to_rate) in _RESAMPLE_FILTERS:
+            # Here it Use the vectorized fixed-ratio FIR resampler
+            samples = np.frombuffer(audio_data, dtype='<i2')
+            return AudioConverter.resample_fixed(samples, from_rate, to_rate).tobytes()
+
+        # Here it Use audioop.ratecv as fallback for unknown ratios
         resampled, _ = audioop.ratecv(
             audio_data,
-            Config.PCM_SAMPLE_WIDTH,
+            _SW,
             1,  # mono
             from_rate,
             to_rate,
             None
         )
         return resampled
-    
+
+    @staticmethod
+    def resample_fixed(samples: 'np.ndarray', from_rate: int, to_rate: int) -> 'np.ndarray':
+        """
+        Resample int16 samples for one of the fixed rate pairs (8k↔16k, 24k→8k)
+
+        Args:
+            samples: int16 NumPy array of mono PCM samples
+            from_rate: Source sample rate (Hz), must form a known pair with to_rate
+            to_rate: Target sample rate (Hz)
+
+        Returns:
+            Resampled int16 NumPy array
+        """
+        if from_rate == to_rate:
+            return samples
+
+        # Empty frames are valid input (audioop.ratecv accepted them, and
+        # np.convolve would raise) - nothing in, nothing out
+        if samples.size == 0:
+            return samples
+
+        up, down, h = _RESAMPLE_FILTERS[(from_rate, to_rate)]
+
+        x = samples.astype(np.float64)
+        if up > 1:
+            # Zero-stuff to the high rate before filtering
+            stuffed = np.zeros(x.size * up)
+            stuffed[::up] = x
+            x = stuffed
+
+        y = np.convolve(x, h)
+
+        # Compensate the FIR group delay so output aligns with input
+        delay = (h.size - 1) // 2
+        n_out = samples.size * up // down
+        y = y[delay:delay + n_out * down:down]
+
+        np.clip(y, -32768, 32767, out=y)
+        return y.astype(np.int16)
+
     @staticmethod
     def decode_twilio_audio(base64_payload: str) -> bytes:
         """
@@ -90,55 +305,170 @@ class AudioConverter:
         # Step 3: Here it Resample from 8kHz to 16kHz for Gemini
         pcm_16khz = AudioConverter.resample_audio(
             pcm_8khz,
-            Config.TWILIO_SAMPLE_RATE,
-            Config.GEMINI_SAMPLE_RATE
+            _TWILIO_SR,
+            _GEMINI_SR
         )
         
         return pcm_16khz
-    
+
+    @staticmethod
+    def decode_twilio_audio_fast(
+        base64_payload: str,
+        scratch: AudioScratch = None,
+        resampler: StreamResampler = None
+    ) -> 'np.ndarray':
+        """
+        Fused decode: base64 → μ-law LUT → 16kHz in one pass, no intermediate
+        bytes objects (the hot-path variant of decode_twilio_audio)
+
+        Args:
+            base64_payload: Base64-encoded μ-law audio from Twilio
+            scratch: Optional per-session AudioScratch; when given, output is
+                     written into its reusable buffers (valid until next call)
+            resampler: Optional per-session StreamResampler; when given,
+                       filter state carries across frames (seamless output)
+
+        Returns:
+            int16 NumPy array of PCM samples at 16kHz for Gemini
+        """
+        return AudioConverter._mulaw_to_pcm16k(
+            base64.b64decode(base64_payload), scratch, resampler
+        )
+
+    @staticmethod
+    def decode_twilio_payloads(
+        payloads: list,
+        scratch: AudioScratch = None,
+        resampler: StreamResampler = None
+    ) -> 'np.ndarray':
+        """
+        Decode a batch of Twilio media payloads in one fused pass
+
+        Unpadded payloads are joined and base64-decoded in a single call
+        (into SIMD-profitable sizes); padded payloads cannot be joined as
+        base64, so they are decoded individually and the μ-law bytes joined.
+        Note that Twilio's standard 160-byte frames always pad, so in
+        production the per-payload branch is the one that runs - the real
+        batching win is that the LUT gather and filter still run once per
+        batch, not per frame.
+
+        Args:
+            payloads: List of base64-encoded μ-law payload strings
+            scratch: Optional per-session AudioScratch
+            resampler: Optional per-session StreamResampler
+
+        Returns:
+            int16 NumPy array of PCM samples at 16kHz for Gemini
+        """
+        if len(payloads) == 1:
+            mulaw_data = base64.b64decode(payloads[0])
+        elif any(p.endswith('=') for p in payloads):
+            mulaw_data = b''.join(base64.b64decode(p) for p in payloads)
+        else:
+            mulaw_data = base64.b64decode(''.join(payloads))
+        return AudioConverter._mulaw_to_pcm16k(mulaw_data, scratch, resampler)
+
+    @staticmethod
+    def _mulaw_to_pcm16k(
+        mulaw_data: bytes,
+        scratch: AudioScratch = None,
+        resampler: StreamResampler = None
+    ) -> 'np.ndarray':
+        """Shared μ-law → 16kHz tail of the fused decode paths"""
+        mulaw_arr = np.frombuffer(mulaw_data, np.uint8)
+        n = mulaw_arr.size
+
+        # All-empty batches (e.g. a media frame with an empty payload)
+        # short-circuit before any filter or JIT path sees zero samples
+        if n == 0:
+            return np.empty(0, np.int16)
+
+        # Fall back to fresh allocations for oversized frames
+        if scratch is not None and n * 2 > scratch.pcm16k.size:
+            scratch = None
+
+        if resampler is not None:
+            # Stateful path: LUT gather, then continue the streaming filter
+            if scratch is not None:
+                pcm_8khz = scratch.pcm8k[:n]
+                np.take(_ULAW2LIN, mulaw_arr, out=pcm_8khz)
+            else:
+                pcm_8khz = _ULAW2LIN[mulaw_arr]
+            return resampler.process(pcm_8khz)
+
+        if _HAS_NUMBA and _TWILIO_SR == 8000 and _GEMINI_SR == 16000:
+            # Single JIT-compiled loop over a preallocated output buffer
+            _, _, h = _RESAMPLE_FILTERS[(8000, 16000)]
+            out = scratch.pcm16k[:n * 2] if scratch is not None else np.empty(n * 2, np.int16)
+            _fused_ulaw_resample2x(mulaw_arr, h, _ULAW2LIN, out)
+            return out
+
+        # LUT gather straight off a zero-copy view of the μ-law bytes
+        if scratch is not None:
+            pcm_8khz = scratch.pcm8k[:n]
+            np.take(_ULAW2LIN, mulaw_arr, out=pcm_8khz)
+        else:
+            pcm_8khz = _ULAW2LIN[mulaw_arr]
+
+        return AudioConverter.resample_fixed(
+            pcm_8khz,
+            _TWILIO_SR,
+            _GEMINI_SR
+        )
+
     @staticmethod
-    def encode_for_twilio(pcm_data: bytes, sample_rate: int = None) -> str:
+    def encode_for_twilio(pcm_data: bytes, sample_rate: int = None) -> bytes:
         """
         Encode PCM audio to base64-encoded μ-law for Twilio
-        
+
         Args:
             pcm_data: PCM audio bytes from Gemini
             sample_rate: Current sample rate of PCM data (default: Gemini's 16kHz)
-            
+
         Returns:
-            Base64-encoded μ-law audio string for Twilio
+            Base64-encoded μ-law audio bytes for Twilio (ASCII; callers that
+            need a str decode once at the network boundary)
         """
         if sample_rate is None:
-            sample_rate = Config.GEMINI_SAMPLE_RATE
+            sample_rate = _GEMINI_SR
         
         # Step 1: Here it Resample from Gemini's rate to Twilio's 8kHz
         pcm_8khz = AudioConverter.resample_audio(
             pcm_data,
             sample_rate,
-            Config.TWILIO_SAMPLE_RATE
+            _TWILIO_SR
         )
         
         # Step 2: Here it Convert PCM to μ-law
         mulaw_data = AudioConverter.pcm_to_mulaw(pcm_8khz)
         
-        # Step 3: Here it Encode to base64
-        base64_payload = base64.b64encode(mulaw_data).decode('utf-8')
-        
-        return base64_payload
+        # Step 3: Here it Encode to base64 (kept as bytes - no str round-trip)
+        return base64.b64encode(mulaw_data)
     
     @staticmethod
-    def chunk_audio(audio_data: bytes, chunk_size: int = 320) -> list:
+    def chunk_audio(audio_data: bytes, chunk_size: int = 320):
         """
         Split audio data into chunks for streaming
-        
+
+        Yields zero-copy memoryview slices over the original buffer; callers
+        that need real bytes (e.g. at a network boundary) should convert there
+
         Args:
             audio_data: Audio bytes to chunk
             chunk_size: Size of each chunk in bytes (default: 320 = 20ms at 8kHz)
-            
-        Returns:
-            List of audio chunks
+
+        Yields:
+            memoryview slices of the audio data
+        """
+        mv = memoryview(audio_data)
+        for i in range(0, len(mv), chunk_size):
+            yield mv[i:i + chunk_size]
+
+    @staticmethod
+    def warmup():
+        """
+        Run the hot decode path once so JIT compilation (when Numba is
+        installed) happens at startup instead of on the first live frame
         """
-        chunks = []
-        for i in range(0, len(audio_data), chunk_size):
-            chunks.append(audio_data[i:i + chunk_size])
-        return chunks
+        silence = base64.b64encode(b'\xff' * 160).decode('ascii')
+        AudioConverter.decode_twilio_audio_fast(silence)
@@ -18,10 +18,26 @@ class Config:
     
     # Audio Configuration
     TWILIO_SAMPLE_RATE = 8000  # Twilio uses 8kHz
-    GEMINI_SAMPLE_RATE = 16000  # Gemini expects 16kHz
+    # Feature flag: send Gemini 8kHz PCM (declared via the audio/pcm mime
+    # rate) so the upstream direction needs no resampling (model quality
+    # may differ; off by default)
+    GEMINI_NATIVE_8K = os.getenv("GEMINI_NATIVE_8K", "false").lower() in ("1", "true", "yes")
+    GEMINI_SAMPLE_RATE = 8000 if GEMINI_NATIVE_8K else 16000  # Gemini input rate
+    # Vertex Live offers no way to request a different output rate, so the
+    # downstream direction always resamples 24kHz down to Twilio's 8kHz
+    # (the flag must not touch this, or the μ-law encoder would mislabel
+    # 24kHz PCM as 8kHz and play it 3x slow)
+    GEMINI_OUTPUT_SAMPLE_RATE = 24000
     AUDIO_ENCODING = "mulaw"  # Twilio uses μ-law encoding
     PCM_SAMPLE_WIDTH = 2  # 16-bit PCM
     
+    # Session pooling: cap concurrent Vertex Live connections (each holds a
+    # websocket + TLS state), and park connections for calls that have been
+    # silent this long - session resumption restores context on the next
+    # utterance, so parked calls cost nothing while idle
+    MAX_LIVE_CONNECTIONS = int(os.getenv("MAX_LIVE_CONNECTIONS", 50))
+    SESSION_IDLE_PARK_SECONDS = float(os.getenv("SESSION_IDLE_PARK_SECONDS", 30))
+
     # Vertex AI Configuration
     VERTEX_PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT", os.getenv("GCP_PROJECT_ID"))
     VERTEX_LOCATION = os.getenv("VERTEX_LOCATION", "us-central1")
@@ -49,5 +65,10 @@ class Config:
                 f"Missing required environment variables: {', '.join(missing)}\n"
                 f"Please check your .env file"
             )
-        
+
+        # Warm the audio hot path so optional JIT compilation cost is paid
+        # at startup rather than by the first caller
+        from audio_converter import AudioConverter
+        AudioConverter.warmup()
+
         return True
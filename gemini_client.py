@@ -1,8 +1,36 @@
 import asyncio
-import base64
+try:
+    import pybase64 as base64  # SIMD-accelerated drop-in (libbase64)
+except ImportError:
+    import base64
 from google import genai
+from google.genai import types
 from config import Config
 
+# Live session config is constant for the process, so build it once
+_GEMINI_LIVE_CONFIG = {
+    "generation_config": {
+        "response_modalities": ["AUDIO"],
+        "speech_config": {
+            "voice_config": {
+                "prebuilt_voice_config": {
+                    "voice_name": "Puck"  # You can change this to other voices
+                }
+            }
+        }
+    }
+}
+
+if Config.GEMINI_NATIVE_8K:
+    # Run the whole session at Twilio's 8kHz so neither direction
+    # needs resampling
+    _GEMINI_LIVE_CONFIG["realtime_input_config"] = {
+        "audio_config": {"sample_rate_hertz": Config.TWILIO_SAMPLE_RATE}
+    }
+    _GEMINI_LIVE_CONFIG["generation_config"]["speech_config"]["audio_encoding"] = "LINEAR16"
+    _GEMINI_LIVE_CONFIG["generation_config"]["speech_config"]["sample_rate_hertz"] = \
+        Config.TWILIO_SAMPLE_RATE
+
 class GeminiClient:
     """Client for interacting with Gemini Live API"""
     
@@ -13,23 +41,10 @@ class GeminiClient:
         
     async def start_session(self):
         """Initialize a Gemini Live session"""
-        config = {
-            "generation_config": {
-                "response_modalities": ["AUDIO"],
-                "speech_config": {
-                    "voice_config": {
-                        "prebuilt_voice_config": {
-                            "voice_name": "Puck"  # You can change this to other voices
-                        }
-                    }
-                }
-            }
-        }
-        
-        # Create async session
+        # Create async session (config is module-level, built once)
         self.session = self.client.aio.live.connect(
             model=self.model_id,
-            config=config
+            config=_GEMINI_LIVE_CONFIG
         )
         
         print(f"✓ Gemini Live session started with model: {self.model_id}")
@@ -44,22 +59,14 @@ class GeminiClient:
         """
         if not self.session:
             raise RuntimeError("Session not started. Call start_session() first.")
-        
-        # Encode PCM to base64 for transmission
-        audio_b64 = base64.b64encode(pcm_audio).decode('utf-8')
-        
-        # Send to Gemini
+
+        # Send raw bytes to Gemini - the SDK base64-encodes once on the wire,
+        # so there is no need to pre-encode here
         await self.session.send(
-            {
-                "realtime_input": {
-                    "media_chunks": [
-                        {
-                            "mime_type": "audio/pcm",
-                            "data": audio_b64
-                        }
-                    ]
-                }
-            }
+            input=types.Blob(
+                data=pcm_audio,
+                mime_type="audio/pcm"
+            )
         )
     
     async def send_text(self, text: str):
@@ -87,31 +94,36 @@ class GeminiClient:
         
         try:
             async for response in self.session.receive():
-                # Handle server content (audio responses)
-                if hasattr(response, 'server_content'):
-                    server_content = response.server_content
-                    
-                    if hasattr(server_content, 'model_turn'):
-                        model_turn = server_content.model_turn
-                        
-                        # Extract audio parts
-                        for part in model_turn.parts:
-                            if hasattr(part, 'inline_data'):
-                                inline_data = part.inline_data
-                                mime_type = inline_data.mime_type
-                                audio_data = inline_data.data
-                                
-                                # Decode base64 audio
-                                audio_bytes = base64.b64decode(audio_data)
-                                
-                                # Call the callback with audio
-                                await audio_callback(audio_bytes, mime_type)
-                
+                # Handle server content (audio responses) - one attribute
+                # descent per response instead of repeated hasattr probes
+                server_content = getattr(response, 'server_content', None)
+                if server_content is None:
+                    continue
+
+                model_turn = getattr(server_content, 'model_turn', None)
+                if model_turn:
+                    # Extract audio parts
+                    for part in model_turn.parts:
+                        inline_data = getattr(part, 'inline_data', None)
+                        if inline_data is None:
+                            continue
+                        mime_type = inline_data.mime_type
+                        audio_data = inline_data.data
+
+                        # Newer SDK versions deliver raw bytes already;
+                        # only base64-decode when given a string
+                        if isinstance(audio_data, (bytes, bytearray)):
+                            audio_bytes = audio_data
+                        else:
+                            audio_bytes = base64.b64decode(audio_data)
+
+                        # Call the callback with audio
+                        await audio_callback(audio_bytes, mime_type)
+
                 # Handle turn complete events
-                if hasattr(response, 'server_content') and \
-                   hasattr(response.server_content, 'turn_complete'):
+                if getattr(server_content, 'turn_complete', False):
                     print("✓ Gemini turn complete")
-                    
+
         except Exception as e:
             print(f"Error receiving from Gemini: {e}")
             raise
@@ -0,0 +1,134 @@
+"""
+Resumption Handle Store
+
+Persists per-stream Gemini Live resumption handles so a process restart
+(rolling deploy, crash) doesn't throw away the conversation context of
+in-flight calls - the restarted process reconnects with the stored handle
+and the model picks up where it left off instead of re-priming from zero.
+
+File-backed by default; the interface is small enough that a Redis-backed
+implementation can be dropped in behind the same three methods.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# Handles are kept for this long after a session ends, so a reconnect
+# racing the cleanup (or a restart mid-teardown) can still resume
+_DELETE_GRACE_SECONDS = 5.0
+
+# Handles expire server-side within minutes, and streams whose sid never
+# reconnects (Twilio won't re-dial a dead media stream) would otherwise
+# sit in the file forever - anything older than this is dropped on load
+_MAX_HANDLE_AGE_SECONDS = 600.0
+
+# Writes are coalesced for this long: handles refresh every few seconds
+# per call, and one deferred write covers a burst of updates
+_FLUSH_DELAY_SECONDS = 1.0
+
+
+class ResumptionStore:
+    """File-backed map of stream_sid -> (resumption handle, saved-at time)"""
+
+    def __init__(self, path: str | None = None):
+        self._path = path or os.getenv(
+            "RESUMPTION_STORE_PATH", ".resumption_handles.json"
+        )
+        self._handles: dict[str, list] = self._load()
+        self._flush_task: asyncio.Task | None = None
+
+    def _load(self) -> dict:
+        """Read whatever the previous process left behind, dropping stale
+        entries so the file can't grow monotonically across restarts"""
+        try:
+            with open(self._path) as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not read resumption store {self._path}: {e}")
+            return {}
+
+        cutoff = time.time() - _MAX_HANDLE_AGE_SECONDS
+        handles = {
+            sid: entry
+            for sid, entry in raw.items()
+            if isinstance(entry, list) and len(entry) == 2 and entry[1] > cutoff
+        }
+        dropped = len(raw) - len(handles)
+        if handles or dropped:
+            logger.info(
+                f"Loaded {len(handles)} resumption handle(s) from "
+                f"{self._path} ({dropped} stale dropped)"
+            )
+        if dropped:
+            self._handles = handles
+            # Rewrite without the dead entries (no event loop yet at
+            # construction time, so write synchronously)
+            try:
+                self._write_atomic(json.dumps(handles))
+            except Exception as e:
+                logger.warning(f"Could not compact resumption store: {e}")
+        return handles
+
+    def get(self, stream_sid: str) -> str | None:
+        """Handle saved for this stream, if any still-fresh one exists"""
+        entry = self._handles.get(stream_sid)
+        if entry is None:
+            return None
+        if entry[1] <= time.time() - _MAX_HANDLE_AGE_SECONDS:
+            del self._handles[stream_sid]
+            return None
+        return entry[0]
+
+    def set(self, stream_sid: str, handle: str):
+        """Record a fresh handle and schedule a coalesced flush to disk"""
+        self._handles[stream_sid] = [handle, time.time()]
+        self._schedule_flush()
+
+    def delete_later(self, stream_sid: str):
+        """Drop the handle after a grace period (see _DELETE_GRACE_SECONDS)"""
+        if stream_sid not in self._handles:
+            return
+
+        async def _delete():
+            await asyncio.sleep(_DELETE_GRACE_SECONDS)
+            if self._handles.pop(stream_sid, None) is not None:
+                self._schedule_flush()
+
+        asyncio.create_task(_delete())
+
+    def _schedule_flush(self):
+        # One in-flight flush at a time; updates landing meanwhile are
+        # picked up by the snapshot taken when it runs
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        await asyncio.sleep(_FLUSH_DELAY_SECONDS)
+        snapshot = json.dumps(self._handles)
+        try:
+            # Write-then-rename so a crash mid-write can't corrupt the store
+            await asyncio.to_thread(self._write_atomic, snapshot)
+        except Exception as e:
+            logger.warning(f"Could not write resumption store {self._path}: {e}")
+
+    def _write_atomic(self, snapshot: str):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
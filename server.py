@@ -1,11 +1,16 @@
 import asyncio
-import json
 import logging
+
+try:
+    import orjson as json  # C parser, 3-10x faster on small messages
+except ImportError:
+    import json
+import numpy as np
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import PlainTextResponse
 import uvicorn
 from config import Config
-from audio_converter import AudioConverter
+from audio_converter import AudioConverter, AudioScratch, StreamResampler
 from twilio_voice_service import twilio_voice_service
 
 # Here it Configure logging
@@ -17,6 +22,35 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Twilio-Gemini Voice Agent (Vertex AI)")
 
+# Pre-built JSON template for outbound media frames - avoids a dict build,
+# json.dumps and a full UTF-8 re-scan of the payload on every send
+# (Twilio Media Streams requires text frames, so this stays a str)
+_MEDIA_PREFIX = '{"event":"media","streamSid":"'
+_MEDIA_MIDDLE = '","media":{"payload":"'
+_MEDIA_SUFFIX = '"}}'
+
+# Inbound batching: 100ms at the Gemini input rate, mono (the batcher
+# reasons in samples, not bytes, so a 16-bit sample can never be split
+# across chunks)
+_GEMINI_CHUNK_SAMPLES = Config.GEMINI_SAMPLE_RATE // 10
+# Ring capacity in samples (half a second of headroom)
+_RING_SAMPLES = Config.GEMINI_SAMPLE_RATE // 2
+
+# Decode inbound base64 payloads in batches of a few frames so the decode
+# crosses the SIMD-profitable size and the LUT/filter run once per batch
+_B64_BATCH_FRAMES = 5
+_B64_BATCH_CHARS = 1024
+
+@app.on_event("startup")
+async def startup():
+    """Prewarm the Vertex AI client so the first call hits a warm auth token"""
+    await twilio_voice_service.prewarm()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared Vertex AI resources (cached content, refresh task)"""
+    await twilio_voice_service.shutdown()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -26,23 +60,24 @@ async def root():
         "backend": "Vertex AI"
     }
 
+# The WebSocket URL (we will need to replace this with our ngrok URL)
+_TWIML_WS_URL = "wss://YOUR_NGROK_URL.ngrok.io/ws"
+
+# Response body is constant, so build it once and serve pre-encoded bytes
+_TWIML_BODY = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Connect>
+        <Stream url="{_TWIML_WS_URL}" />
+    </Connect>
+</Response>""".encode()
+
 @app.post("/twiml")
 async def twiml():
     """
     TwiML endpoint for Twilio to connect the call to WebSocket
     This is what you configure in your Twilio phone number settings
     """
-    # Get the WebSocket URL (we will need to replace this with our ngrok URL)
-    ws_url = "wss://YOUR_NGROK_URL.ngrok.io/ws"
-    
-    twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Connect>
-        <Stream url="{ws_url}" />
-    </Connect>
-</Response>"""
-    
-    return PlainTextResponse(content=twiml, media_type="application/xml")
+    return PlainTextResponse(content=_TWIML_BODY, media_type="application/xml")
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -56,13 +91,30 @@ async def websocket_endpoint(websocket: WebSocket):
     stream_sid = None
     live_session = None
     receiver_task = None
-    
+
+    # Inbound audio batcher: int16-typed ring with head/tail indices, so
+    # emitting a chunk is a zero-copy slice and always sample-aligned
+    ring = np.empty(_RING_SAMPLES, np.int16)
+    ring_head = 0
+    ring_tail = 0
+
+    # Pending base64 payloads awaiting a batched decode
+    pending_b64 = []
+    pending_chars = 0
+
+    # Reusable per-session work buffers for the decode hot path
+    scratch = AudioScratch()
+
+    # Per-stream resamplers so filter state carries across frames instead of
+    # restarting from zero (and clicking) at every frame boundary
+    in_resampler = StreamResampler(Config.TWILIO_SAMPLE_RATE, Config.GEMINI_SAMPLE_RATE)
+    out_resampler = StreamResampler(Config.GEMINI_OUTPUT_SAMPLE_RATE, Config.TWILIO_SAMPLE_RATE)
+
     try:
-        # Main loop: received from Twilio
-        while True:
+        # Main loop: received from Twilio (iter_text reuses one generator
+        # instead of re-priming a Future per frame)
+        async for data in websocket.iter_text():
             try:
-                # Received message from Twilio
-                data = await websocket.receive_text()
                 message = json.loads(data)
                 
                 event = message.get("event")
@@ -76,6 +128,9 @@ async def websocket_endpoint(websocket: WebSocket):
                     live_session = await twilio_voice_service.get_or_create_session(
                         stream_sid, websocket=websocket
                     )
+
+                    # Built the per-stream media frame template once
+                    media_prefix = _MEDIA_PREFIX + stream_sid + _MEDIA_MIDDLE
                     
                     # Started listening for Gemini responses
                     async def stream_responses():
@@ -85,22 +140,28 @@ async def websocket_endpoint(websocket: WebSocket):
                                 
                                 if event_type == "audio_chunk":
                                     # Converted Gemini's audio to Twilio format
+                                    # (event carries a memoryview; frombuffer
+                                    # reads it in place, no copy)
                                     audio_bytes = event["data"]
-                                    
-                                    # Gemini sends PCM at 24kHz, converted to μ-law 8kHz
+
+                                    # Gemini sends PCM at 24kHz; downsampled via
+                                    # the stateful per-stream resampler, then μ-law
+                                    pcm_8k = out_resampler.process(
+                                        np.frombuffer(audio_bytes, dtype='<i2')
+                                    )
                                     base64_audio = AudioConverter.encode_for_twilio(
-                                        audio_bytes, 
-                                        sample_rate=24000
+                                        pcm_8k.tobytes(),
+                                        sample_rate=Config.TWILIO_SAMPLE_RATE
                                     )
                                     
-                                    # Send to Twilio
-                                    await websocket.send_json({
-                                        "event": "media",
-                                        "streamSid": stream_sid,
-                                        "media": {
-                                            "payload": base64_audio
-                                        }
-                                    })
+                                    # Send to Twilio via the pre-built template;
+                                    # the payload stays bytes until this single
+                                    # ASCII decode at the network boundary
+                                    await websocket.send_text(
+                                        media_prefix
+                                        + base64_audio.decode('ascii')
+                                        + _MEDIA_SUFFIX
+                                    )
                                     logger.debug(f"→ Sent {len(base64_audio)} bytes to Twilio")
                                 
                                 elif event_type == "turn_complete":
@@ -123,29 +184,50 @@ async def websocket_endpoint(websocket: WebSocket):
                     receiver_task = asyncio.create_task(stream_responses())
                 
                 elif event == "media":
-                    # Audio data from caller - streamed directly without buffering
+                    # Audio data from caller - batched into 100ms chunks
                     if live_session:
-                        payload = message["media"]["payload"]
-                        
-                        # Converted Twilio audio to Gemini format (PCM 16kHz)
-                        pcm_audio = AudioConverter.decode_twilio_audio(payload)
-                        
-                        # Sent directly to Gemini (no chunk buffering)
-                        await live_session.send_audio(pcm_audio)
-                        logger.debug(f"← Received {len(payload)} bytes from Twilio, sent to Gemini")
+                        pending_b64.append(message["media"]["payload"])
+                        pending_chars += len(pending_b64[-1])
+                        if (len(pending_b64) < _B64_BATCH_FRAMES
+                                and pending_chars < _B64_BATCH_CHARS):
+                            continue
+
+                        # Converted the batch to Gemini format (PCM 16kHz) in
+                        # one fused pass; bytes only materialize at the send
+                        pcm_audio = AudioConverter.decode_twilio_payloads(
+                            pending_b64, scratch, in_resampler
+                        )
+                        pending_b64 = []
+                        pending_chars = 0
+                        n = pcm_audio.size
+
+                        # Wrapped live samples back to the front when needed
+                        if ring_tail + n > ring.size:
+                            live = ring_tail - ring_head
+                            ring[:live] = ring[ring_head:ring_tail]
+                            ring_head = 0
+                            ring_tail = live
+                        ring[ring_tail:ring_tail + n] = pcm_audio
+                        ring_tail += n
+
+                        # Emitted full 100ms chunks as zero-copy slices
+                        while ring_tail - ring_head >= _GEMINI_CHUNK_SAMPLES:
+                            chunk = ring[ring_head:ring_head + _GEMINI_CHUNK_SAMPLES]
+                            ring_head += _GEMINI_CHUNK_SAMPLES
+                            await live_session.send_audio(chunk.tobytes())
+                            logger.debug(f"← Sent {chunk.size} sample chunk to Gemini")
                 
                 elif event == "stop":
                     # Stream stopped
                     logger.info(f"✓ Stream stopped: {stream_sid}")
                     break
-            
-            except WebSocketDisconnect:
-                logger.info("✗ WebSocket disconnected")
-                break
+
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 continue
-    
+
+    except WebSocketDisconnect:
+        logger.info("✗ WebSocket disconnected")
     except Exception as e:
         logger.error(f"Error in WebSocket handler: {e}")
     
@@ -197,5 +279,8 @@ if __name__ == "__main__":
         app,
         host=Config.HOST,
         port=Config.PORT,
+        loop="uvloop",       # libuv event loop, much faster socket dispatch
+        http="httptools",    # C HTTP parser
+        ws="websockets",
         log_level="info"
     )
@@ -9,14 +9,50 @@ Features:
 """
 
 import asyncio
+import collections
+import concurrent.futures
 import logging
+import random
+from dataclasses import dataclass, field
 from google import genai
 from google.genai import types
 from config import Config
+from resumption_store import ResumptionStore
 
 logger = logging.getLogger(__name__)
 
-_RECONNECT_DELAY = 1.5
+# Reconnect backoff: start near-instant (session resumption makes an
+# immediate retry cheap, and 1.5s of silence mid-call is an eternity),
+# double per consecutive failure with ±20% jitter, cap at 2s
+_RECONNECT_DELAY_INITIAL = 0.1
+_RECONNECT_DELAY_MAX = 2.0
+
+# Transcription fragments are coalesced for this long (or until this many
+# chars) before being forwarded, instead of waking the consumer per token
+_TRANSCRIPTION_FLUSH_DELAY = 0.02
+_TRANSCRIPTION_FLUSH_CHARS = 128
+
+# Cap on buffered session events: with no consumer attached (or a stalled
+# one) the event deque would otherwise grow without bound
+_MAX_PENDING_EVENTS = 64
+
+# Cap on queued outbound chunks (~100ms of PCM each): Twilio streams
+# continuously, so a long reconnect would otherwise bank minutes of stale
+# caller audio and ship it to Gemini as one giant blob afterwards
+_MAX_PENDING_SENDS = 64
+
+# Mime type for upstream PCM - constant for the process, so skip
+# re-validating it per frame; the rate follows the configured Gemini
+# input rate (8kHz when GEMINI_NATIVE_8K is on)
+_PCM_MIME = f"audio/pcm;rate={Config.GEMINI_SAMPLE_RATE}"
+
+# Sentinel pushed on close so receive() exits without polling for _closed
+_CLOSE = object()
+
+# Send batches at or above this size have their assembly (the bytes join)
+# run on the I/O pool so a reconnect backlog doesn't stall the event loop;
+# normal 100ms batches stay inline where a join is microseconds
+_OFFLOAD_JOIN_BYTES = 64 * 1024
 
 SYSTEM_INSTRUCTION = """You are a helpful voice assistant powered by Twilio and Google Gemini.
 
@@ -29,32 +65,85 @@ Communication style:
 - Clear and simple language
 - One topic at a time"""
 
+# Built once at import: the prompt is a constant, so there is no reason to
+# re-run the Part/Content validators on every service init or reconnect
+_SYSTEM_CONTENT = types.Content(
+    parts=[types.Part.from_text(text=SYSTEM_INSTRUCTION)],
+    role="user"
+)
+
 
 class TwilioVoiceSession:
     """Manages a single Vertex AI Gemini Live session for a Twilio call"""
     
     def __init__(self):
-        self._queue = asyncio.Queue()
+        # Deque + one Event instead of asyncio.Queue: the producer appends
+        # without touching waiter machinery and wakes the consumer once per
+        # batch, which then drains everything pending in one go
+        self._deque = collections.deque()
+        self._ready = asyncio.Event()
         self._session = None
         self._closed = False
+        self._dropped_audio = 0
+
+        # Outbound PCM queue drained by the writer task, so the Twilio
+        # ingest loop never awaits the Gemini SDK directly
+        self._send_deque = collections.deque()
+        self._send_ready = asyncio.Event()
+
+        # Activity tracking for idle parking
+        self._last_send = 0.0
+        self._activity = asyncio.Event()
+        self._parked = False
+
+    def _push(self, event: dict):
+        """Enqueue an event for receive() and wake the consumer"""
+        self._deque.append(event)
+        self._ready.set()
+
+    def _signal_close(self):
+        """Mark the session closed and wake receive() so it exits promptly"""
+        self._closed = True
+        self._deque.append(_CLOSE)
+        self._ready.set()
+
+    def _push_audio(self, event: dict):
+        """
+        Enqueue an audio chunk, dropping the oldest buffered audio when the
+        consumer is not keeping up (control events never drop - stale audio
+        is worthless for a live call, a missed turn_complete is not)
+        """
+        if len(self._deque) >= _MAX_PENDING_EVENTS:
+            for i, pending in enumerate(self._deque):
+                if pending["type"] == "audio_chunk":
+                    del self._deque[i]
+                    self._dropped_audio += 1
+                    if self._dropped_audio % 50 == 1:
+                        logger.warning(
+                            f"Audio backlog full, dropped "
+                            f"{self._dropped_audio} chunks so far"
+                        )
+                    break
+        self._push(event)
 
     async def send_audio(self, audio_data: bytes):
-        """Send PCM audio to Gemini (no buffering/chunking)"""
+        """Queue PCM audio for the writer task (never blocks on Gemini I/O)"""
         if self._closed:
             raise RuntimeError("Session is closed")
-        if self._session is None:
-            logger.debug("send_audio: session not ready, dropping chunk")
-            return
-        try:
-            await self._session.send_realtime_input(
-                audio=types.Blob(
-                    data=audio_data,
-                    mime_type="audio/pcm;rate=16000"
+        if len(self._send_deque) >= _MAX_PENDING_SENDS:
+            # Same policy as _push_audio: stale audio is worthless for a
+            # live call, so keep the freshest and drop from the front
+            self._send_deque.popleft()
+            self._dropped_audio += 1
+            if self._dropped_audio % 50 == 1:
+                logger.warning(
+                    f"Send backlog full, dropped "
+                    f"{self._dropped_audio} chunks so far"
                 )
-            )
-        except Exception as e:
-            logger.debug(f"send_audio: session closed mid-send, dropping chunk ({e})")
-            self._session = None
+        self._send_deque.append(audio_data)
+        self._send_ready.set()
+        self._last_send = asyncio.get_running_loop().time()
+        self._activity.set()
 
     async def receive(self):
         """
@@ -65,32 +154,171 @@ class TwilioVoiceSession:
           {"type": "output_transcription", "text": str}
           {"type": "error", "error": str}
         """
-        while not self._closed:
-            try:
-                event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                yield event
-            except asyncio.TimeoutError:
+        # No timeout polling: the producer wakes us per batch, and close is
+        # signalled with a sentinel, so idle sessions register no timers
+        while True:
+            if not self._deque:
+                if self._closed:
+                    return
+                await self._ready.wait()
+                self._ready.clear()
                 continue
+            event = self._deque.popleft()
+            if event is _CLOSE:
+                return
+            yield event
+
+
+class VertexCacheManager:
+    """
+    Manages an explicit Vertex AI cachedContents entry for the static
+    system instruction (cached tokens are billed at a steep discount and
+    skip re-processing on every connect)
+
+    LiveConnectConfig only accepts cached content on SDK versions that
+    expose the field, so everything here is gated on support detection;
+    without support the inline system_instruction path is used unchanged.
+    """
+
+    TTL_SECONDS = 3600
+
+    def __init__(self, client, system_instruction):
+        self._client = client
+        self._system_instruction = system_instruction
+        self.cache_name = None
+        self._refresh_task = None
+
+    @staticmethod
+    def supported() -> bool:
+        """True when the SDK can both create caches and wire them into Live"""
+        return (
+            getattr(types, "CreateCachedContentConfig", None) is not None
+            and "cached_content" in types.LiveConnectConfig.model_fields
+        )
+
+    async def start(self):
+        """Create the cache entry and keep its TTL refreshed"""
+        if not self.supported():
+            logger.info("cachedContents not supported by this SDK, using inline system instruction")
+            return
+        try:
+            cache = await self._client.aio.caches.create(
+                model=Config.VERTEX_LIVE_MODEL,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=self._system_instruction,
+                    ttl=f"{self.TTL_SECONDS}s",
+                ),
+            )
+            self.cache_name = cache.name
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            logger.info(f"✓ System instruction cached as {self.cache_name}")
+        except Exception as e:
+            logger.warning(f"cachedContents create failed, using inline system instruction: {e}")
+
+    async def _refresh_loop(self):
+        """Bump the TTL before it expires so live calls never lose the cache"""
+        while True:
+            await asyncio.sleep(self.TTL_SECONDS * 0.8)
+            try:
+                await self._client.aio.caches.update(
+                    name=self.cache_name,
+                    config=types.UpdateCachedContentConfig(
+                        ttl=f"{self.TTL_SECONDS}s"
+                    ),
+                )
+            except Exception as e:
+                logger.warning(f"cachedContents TTL refresh failed: {e}")
+
+    async def shutdown(self):
+        """Stop refreshing and delete the cache entry"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self.cache_name:
+            try:
+                await self._client.aio.caches.delete(name=self.cache_name)
+            except Exception as e:
+                logger.warning(f"cachedContents delete failed: {e}")
+            self.cache_name = None
+
+
+@dataclass(slots=True)
+class _SessionRecord:
+    """
+    Everything the service tracks per stream_sid, in one slotted record -
+    one dict lookup on the admin path instead of one per parallel dict,
+    and no per-instance __dict__
+    """
+    session: TwilioVoiceSession
+    ready: asyncio.Event
+    task: asyncio.Task | None = None
+    stop: asyncio.Event = field(default_factory=asyncio.Event)
 
 
 class TwilioVoiceService:
     """Manages Vertex AI Gemini Live sessions for Twilio calls"""
     
-    def __init__(self):
+    def __init__(self, resumption_store: ResumptionStore | None = None):
         if not Config.VERTEX_PROJECT_ID:
             raise ValueError(
                 "GOOGLE_CLOUD_PROJECT or GCP_PROJECT_ID env variable required"
             )
 
+        # Handles survive a process restart here, so rolling deploys don't
+        # cost every in-flight call its conversation context
+        self._resumption_store = resumption_store or ResumptionStore()
+
         self.client = genai.Client(
             vertexai=True,
             project=Config.VERTEX_PROJECT_ID,
             location=Config.VERTEX_LOCATION,
         )
 
-        self.active_sessions: dict[str, TwilioVoiceSession] = {}
-        self.ready_events: dict[str, asyncio.Event] = {}
-        self._run_tasks: dict[str, asyncio.Task] = {}
+        # One record per stream_sid; record.stop is set before the run task
+        # is cancelled, so the reconnect loop has a deterministic stop
+        # signal instead of probing dict membership
+        self._records: dict[str, _SessionRecord] = {}
+
+        # Serializes session creation per sid: two webhook events racing
+        # through get_or_create_session would otherwise each open a Vertex
+        # connection (and each pay the 1-3s auth handshake) for one call
+        self._create_locks: dict[str, asyncio.Lock] = {}
+
+        # Static pieces of LiveConnectConfig, validated once here - the
+        # reconnect path only needs a fresh resumption handle, not seven
+        # re-validated Pydantic models
+        self._base_speech_config = types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name="Puck"
+                )
+            )
+        )
+        self._base_context_compression = types.ContextWindowCompressionConfig(
+            sliding_window=types.SlidingWindow(),
+        )
+        self._base_input_transcription = types.AudioTranscriptionConfig()
+        self._base_output_transcription = types.AudioTranscriptionConfig()
+
+        self._cache_manager = VertexCacheManager(
+            self.client, _SYSTEM_CONTENT
+        )
+
+        # Small thread pool for synchronous work that would otherwise run
+        # on the event loop (large send-batch assembly, and anything else
+        # that profiling shows blocking)
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="vertex-io"
+        )
+
+        # Bounded pool of concurrent Vertex connections (lanes): calls beyond
+        # the cap wait for a lane instead of piling up websockets, and parked
+        # idle calls release theirs
+        self._lanes = asyncio.Semaphore(Config.MAX_LIVE_CONNECTIONS)
 
         logger.info(
             f"TwilioVoiceService initialized — "
@@ -99,181 +327,482 @@ class TwilioVoiceService:
             f"model={Config.VERTEX_LIVE_MODEL}"
         )
 
+    async def prewarm(self):
+        """
+        Warm the shared client's auth token with a throwaway cheap call, so
+        the first real call doesn't pay the Vertex AI cold start (1-3s of
+        auth handshake) inside the session-ready deadline
+        """
+        try:
+            await self.client.aio.models.list(config={"page_size": 1})
+            logger.info("✓ Vertex AI client prewarmed")
+        except Exception as e:
+            logger.warning(
+                f"Prewarm failed (first call will pay the auth cold start): {e}"
+            )
+
+        await self._cache_manager.start()
+
+    async def shutdown(self):
+        """Release shared resources at server shutdown"""
+        await self._cache_manager.shutdown()
+        self._io_pool.shutdown(wait=False)
+
     async def get_or_create_session(
         self,
         stream_sid: str,
         websocket=None
     ) -> TwilioVoiceSession:
         """Get existing session or create new one for this Twilio stream"""
-        if stream_sid in self.active_sessions:
-            session = self.active_sessions[stream_sid]
-            if not session._closed:
-                logger.debug(f"Reusing session for {stream_sid}")
-                return session
-            await self._cleanup(stream_sid)
-
-        logger.info(f"Creating new session for {stream_sid}")
+        record = self._records.get(stream_sid)
+        if record is not None and not record.session._closed:
+            logger.debug(f"Reusing session for {stream_sid}")
+            return record.session
+
+        lock = self._create_locks.setdefault(stream_sid, asyncio.Lock())
+        async with lock:
+            # Re-check under the lock: a concurrent caller may have created
+            # the session while we waited
+            record = self._records.get(stream_sid)
+            if record is not None:
+                if not record.session._closed:
+                    return record.session
+                await self._cleanup(stream_sid)
+
+            logger.info(f"Creating new session for {stream_sid}")
+
+            # Registered synchronously so callers get a session object before
+            # the Vertex websocket is even dialled - send_audio buffers into the
+            # send deque and the writer task drains it once connected, so no
+            # audio is dropped waiting on a slow TLS handshake
+            record = _SessionRecord(
+                session=TwilioVoiceSession(),
+                ready=asyncio.Event(),
+            )
+            self._records[stream_sid] = record
 
-        ready_event = asyncio.Event()
-        self.ready_events[stream_sid] = ready_event
+            record.task = asyncio.create_task(
+                self._run(stream_sid, record.session, record.ready, websocket)
+            )
 
-        task = asyncio.create_task(self._run(stream_sid, ready_event, websocket))
-        self._run_tasks[stream_sid] = task
+        # Lock entries are transient - drop this one so the dict doesn't
+        # grow by one Lock per call ever handled
+        self._create_locks.pop(stream_sid, None)
 
         try:
-            await asyncio.wait_for(ready_event.wait(), timeout=10.0)
+            await asyncio.wait_for(record.ready.wait(), timeout=10.0)
         except asyncio.TimeoutError:
-            logger.error(f"Session for {stream_sid} timed out")
-            await self.end_session(stream_sid)
-            raise RuntimeError("Gemini Live session initialization timed out")
+            # Not fatal: the reconnect loop keeps trying and queued audio
+            # survives, so hand the buffering session back instead of
+            # failing the call
+            logger.warning(
+                f"Session for {stream_sid} still connecting after 10s, "
+                f"buffering audio until it's up"
+            )
 
-        return self.active_sessions[stream_sid]
+        return record.session
+
+    def _make_config(self, resumption_handle) -> 'types.LiveConnectConfig':
+        """Build a LiveConnectConfig around the prebuilt static sub-objects"""
+        kwargs = dict(
+            response_modalities=["AUDIO"],
+            speech_config=self._base_speech_config,
+            context_window_compression=self._base_context_compression,
+            session_resumption=types.SessionResumptionConfig(
+                handle=resumption_handle
+            ),
+            input_audio_transcription=self._base_input_transcription,
+            output_audio_transcription=self._base_output_transcription,
+        )
+        if self._cache_manager.cache_name:
+            # The cache entry carries the system instruction
+            kwargs["cached_content"] = self._cache_manager.cache_name
+        else:
+            kwargs["system_instruction"] = _SYSTEM_CONTENT
+        return types.LiveConnectConfig(**kwargs)
 
     async def end_session(self, stream_sid: str):
         """End session for this Twilio stream"""
         logger.info(f"Ending session for {stream_sid}")
         await self._cleanup(stream_sid)
 
-    async def _run(self, stream_sid: str, ready_event: asyncio.Event, websocket):
-        """Main session loop with auto-reconnect and session resumption"""
-        live_session = TwilioVoiceSession()
-        self.active_sessions[stream_sid] = live_session
+    async def _sender_loop(self, live_session: TwilioVoiceSession):
+        """
+        Drain queued PCM and ship it to Gemini, concatenating whatever is
+        pending into one Blob per send so SDK and websocket-frame overhead
+        amortizes across chunks
+        """
+        loop = asyncio.get_running_loop()
+        while not live_session._closed:
+            if not live_session._send_deque:
+                await live_session._send_ready.wait()
+                live_session._send_ready.clear()
+                continue
 
-        resumption_handle = None
+            session = live_session._session
+            if session is None:
+                # Reconnect in progress - keep the audio queued
+                await asyncio.sleep(0.05)
+                continue
+
+            if len(live_session._send_deque) == 1:
+                buf = live_session._send_deque.popleft()
+            else:
+                chunks = list(live_session._send_deque)
+                live_session._send_deque.clear()
+                if sum(map(len, chunks)) >= _OFFLOAD_JOIN_BYTES:
+                    # Backlog from a reconnect/park: assemble off-loop so
+                    # the copy doesn't add jitter to every other session
+                    buf = await loop.run_in_executor(
+                        self._io_pool, b"".join, chunks
+                    )
+                else:
+                    buf = b"".join(chunks)
 
-        while True:
             try:
-                logger.info(
-                    f"Connecting to Vertex AI Gemini Live for {stream_sid}"
-                    + (" (resuming)" if resumption_handle else " (new)")
+                # model_construct skips the Pydantic validator chain - both
+                # fields are already known-good (bytes + constant mime)
+                await session.send_realtime_input(
+                    audio=types.Blob.model_construct(
+                        data=buf,
+                        mime_type=_PCM_MIME
+                    )
                 )
+            except Exception as e:
+                logger.debug(f"sender: session closed mid-send, dropping batch ({e})")
+                live_session._session = None
 
-                config = types.LiveConnectConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        voice_config=types.VoiceConfig(
-                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                voice_name="Puck"
-                            )
-                        )
-                    ),
-                    system_instruction=types.Content(
-                        parts=[types.Part.from_text(text=SYSTEM_INSTRUCTION)],
-                        role="user"
-                    ),
-                    context_window_compression=types.ContextWindowCompressionConfig(
-                        sliding_window=types.SlidingWindow(),
-                    ),
-                    session_resumption=types.SessionResumptionConfig(
-                        handle=resumption_handle
-                    ),
-                    input_audio_transcription=types.AudioTranscriptionConfig(),
-                    output_audio_transcription=types.AudioTranscriptionConfig(),
+    async def _idle_watchdog(self, stream_sid: str, live_session: TwilioVoiceSession, session):
+        """
+        Park the connection once the caller has been silent for
+        SESSION_IDLE_PARK_SECONDS: closing it frees a lane, and session
+        resumption restores full context the moment audio arrives again
+        """
+        loop = asyncio.get_running_loop()
+        if not live_session._last_send:
+            live_session._last_send = loop.time()
+        while True:
+            idle = loop.time() - live_session._last_send
+            remaining = Config.SESSION_IDLE_PARK_SECONDS - idle
+            if remaining <= 0:
+                # Clear before the final check so a send racing the park
+                # immediately satisfies the wakeup wait in _run
+                live_session._activity.clear()
+                if not live_session._send_deque:
+                    live_session._parked = True
+                    logger.info(f"Parking idle session for {stream_sid}")
+                    await session.close()
+                    return
+                remaining = 1.0
+            await asyncio.sleep(max(remaining, 1.0))
+
+    async def _run(
+        self,
+        stream_sid: str,
+        live_session: TwilioVoiceSession,
+        ready_event: asyncio.Event,
+        websocket,
+    ):
+        """Main session loop with auto-reconnect and session resumption"""
+        sender_task = asyncio.create_task(self._sender_loop(live_session))
+
+        # A handle left by a previous process (rolling deploy, crash) means
+        # the very first connect already resumes with full context
+        resumption_handle = self._resumption_store.get(stream_sid)
+
+        # Transcription coalescing: Gemini streams 1-3 token fragments, and
+        # forwarding each one separately multiplies wakeups downstream
+        loop = asyncio.get_running_loop()
+        in_buf: list[str] = []
+        out_buf: list[str] = []
+        flush_handle = None
+
+        def _flush_transcriptions():
+            nonlocal flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+                flush_handle = None
+            if in_buf:
+                live_session._push({
+                    "type": "input_transcription",
+                    "text": "".join(in_buf),
+                })
+                in_buf.clear()
+            if out_buf:
+                live_session._push({
+                    "type": "output_transcription",
+                    "text": "".join(out_buf),
+                })
+                out_buf.clear()
+
+        def _buffer_transcription(buf: list, text: str):
+            nonlocal flush_handle
+            buf.append(text)
+            if sum(map(len, buf)) > _TRANSCRIPTION_FLUSH_CHARS:
+                _flush_transcriptions()
+            elif flush_handle is None:
+                flush_handle = loop.call_later(
+                    _TRANSCRIPTION_FLUSH_DELAY, _flush_transcriptions
                 )
 
-                async with self.client.aio.live.connect(
+        delay = _RECONNECT_DELAY_INITIAL
+
+        # Called on the first successful connect only; reconnects never
+        # touch ready_event again
+        on_ready = ready_event.set
+
+        # Successor connection preopened on GoAway: (context manager,
+        # session) ready to adopt the moment the old connection dies
+        successor = None
+        successor_task = None
+
+        async def _prewarm_successor():
+            """
+            Open the replacement connection while the doomed one is still
+            serving, and cut sends over as soon as it's up - the GoAway
+            advance warning buys us a reconnect with zero audible gap
+            """
+            nonlocal successor
+            cm = self.client.aio.live.connect(
+                model=Config.VERTEX_LIVE_MODEL,
+                config=self._make_config(resumption_handle),
+            )
+            try:
+                new_session = await cm.__aenter__()
+            except Exception as e:
+                logger.warning(
+                    f"Successor connect for {stream_sid} failed, "
+                    f"falling back to normal reconnect: {e}"
+                )
+                return
+            successor = (cm, new_session)
+            live_session._session = new_session
+            logger.info(f"Successor session ready for {stream_sid}, sends cut over")
+
+        async def _one_session():
+            """Open one Vertex connection and pump it until it closes"""
+            nonlocal resumption_handle, delay, on_ready, successor, successor_task
+            idle_task = None
+
+            if successor is not None:
+                # Adopt the connection preopened on the last GoAway
+                cm, session = successor
+                successor = None
+                successor_task = None
+            else:
+                cm = self.client.aio.live.connect(
                     model=Config.VERTEX_LIVE_MODEL,
-                    config=config,
-                ) as session:
-
-                    live_session._session = session
-
-                    if not ready_event.is_set():
-                        ready_event.set()
-                        logger.info(f"ready_event set for {stream_sid}")
-
-                    if websocket:
-                        try:
-                            await websocket.send_json({
-                                "type": "connected",
-                                "backend": "vertex_ai",
-                                "model": Config.VERTEX_LIVE_MODEL,
-                            })
-                        except Exception:
-                            pass
-
-                    async for response in session.receive():
-
-                        # Updated resumption handle
-                        if response.session_resumption_update:
-                            update = response.session_resumption_update
-                            if update.resumable and update.new_handle:
-                                resumption_handle = update.new_handle
-                                logger.debug(f"Resumption handle updated for {stream_sid}")
-
-                        # Logged GoAway signal
-                        if response.go_away is not None:
-                            logger.warning(
-                                f"GoAway received for {stream_sid}, "
-                                f"time_left={response.go_away.time_left}"
-                            )
+                    config=self._make_config(resumption_handle),
+                )
+                session = await cm.__aenter__()
 
-                        sc = response.server_content
-
-                        if sc:
-                            # Audio chunks from Gemini
-                            if sc.model_turn:
-                                for part in sc.model_turn.parts:
-                                    if part.inline_data and part.inline_data.data:
-                                        await live_session._queue.put({
-                                            "type": "audio_chunk",
-                                            "data": part.inline_data.data,
-                                        })
-
-                            # Turn complete
-                            if sc.turn_complete:
-                                await live_session._queue.put({"type": "turn_complete"})
-
-                            # Input transcription (user speech)
-                            if sc.input_transcription and sc.input_transcription.text:
-                                await live_session._queue.put({
-                                    "type": "input_transcription",
-                                    "text": sc.input_transcription.text,
-                                })
-
-                            # Output transcription (AI speech)
-                            if sc.output_transcription and sc.output_transcription.text:
-                                await live_session._queue.put({
-                                    "type": "output_transcription",
-                                    "text": sc.output_transcription.text,
-                                })
+            try:
 
-                live_session._session = None
-                logger.info(f"Gemini session closed cleanly for {stream_sid}, reconnecting...")
+                live_session._session = session
+                idle_task = asyncio.create_task(
+                    self._idle_watchdog(stream_sid, live_session, session)
+                )
 
-            except asyncio.CancelledError:
-                logger.info(f"Run task cancelled for {stream_sid}")
-                break
+                if on_ready is not None:
+                    on_ready()
+                    on_ready = None
+                    logger.info(f"ready_event set for {stream_sid}")
+
+                if websocket:
+                    try:
+                        await websocket.send_json({
+                            "type": "connected",
+                            "backend": "vertex_ai",
+                            "model": Config.VERTEX_LIVE_MODEL,
+                        })
+                    except Exception:
+                        pass
+
+                # Hoisted method lookups for the per-event hot loop
+                push_audio = live_session._push_audio
+                push = live_session._push
+
+                # Connection is healthy - next failure backs off from
+                # the bottom again
+                delay = _RECONNECT_DELAY_INITIAL
+
+                async for response in session.receive():
+                    # One Pydantic attribute descent each, then branch
+                    # off the locals (each dotted access runs the model's
+                    # __getattr__ machinery)
+                    update = response.session_resumption_update
+                    go_away = response.go_away
+                    sc = response.server_content
+
+                    # Updated resumption handle
+                    if update:
+                        if update.resumable and update.new_handle:
+                            resumption_handle = update.new_handle
+                            self._resumption_store.set(
+                                stream_sid, update.new_handle
+                            )
+                            logger.debug(f"Resumption handle updated for {stream_sid}")
+
+                    # GoAway: the server gave us advance warning, so open
+                    # the replacement now instead of waiting for the close
+                    if go_away is not None:
+                        logger.warning(
+                            f"GoAway received for {stream_sid}, "
+                            f"time_left={go_away.time_left}"
+                        )
+                        if successor is None and (
+                            successor_task is None or successor_task.done()
+                        ):
+                            successor_task = asyncio.create_task(
+                                _prewarm_successor()
+                            )
 
-            except Exception as e:
-                if stream_sid not in self._run_tasks:
+                    if sc:
+                        model_turn = sc.model_turn
+                        input_tr = sc.input_transcription
+                        output_tr = sc.output_transcription
+
+                        # Audio chunks from Gemini
+                        if model_turn:
+                            for part in model_turn.parts:
+                                inline = part.inline_data
+                                if inline and inline.data:
+                                    # memoryview: downstream reads the
+                                    # SDK's bytes in place instead of
+                                    # copying once per 20ms frame
+                                    push_audio({
+                                        "type": "audio_chunk",
+                                        "data": memoryview(inline.data),
+                                    })
+
+                        # Turn complete (flush any buffered transcription
+                        # first so ordering is preserved)
+                        if sc.turn_complete:
+                            _flush_transcriptions()
+                            push({"type": "turn_complete"})
+
+                        # Input transcription (user speech)
+                        if input_tr and input_tr.text:
+                            _buffer_transcription(in_buf, input_tr.text)
+
+                        # Output transcription (AI speech)
+                        if output_tr and output_tr.text:
+                            _buffer_transcription(out_buf, output_tr.text)
+
+                # Sends may already be cut over to a GoAway successor;
+                # only clear the pointer if it is still this connection
+                if live_session._session is session:
+                    live_session._session = None
+
+            finally:
+                if idle_task is not None:
+                    idle_task.cancel()
+                try:
+                    await cm.__aexit__(None, None, None)
+                except Exception:
+                    pass
+
+        # Teardown must run no matter where cancellation lands (the
+        # parked wait, the backoff sleep and the lane acquire all sit
+        # outside the per-connection try), so the loop is wrapped whole
+        try:
+            while True:
+                # Each connection holds a lane while it is actually open; parked
+                # sessions give theirs back
+                await self._lanes.acquire()
+                try:
+                    logger.info(
+                        f"Connecting to Vertex AI Gemini Live for {stream_sid}"
+                        + (" (resuming)" if resumption_handle else " (new)")
+                    )
+
+                    await _one_session()
+
+                    if not live_session._parked and successor is None:
+                        logger.info(f"Gemini session closed cleanly for {stream_sid}, reconnecting...")
+
+                except asyncio.CancelledError:
+                    logger.info(f"Run task cancelled for {stream_sid}")
                     break
-                logger.warning(
-                    f"Session error for {stream_sid}: {e} — "
-                    f"reconnecting in {_RECONNECT_DELAY}s..."
-                )
-                live_session._session = None
-
-            await asyncio.sleep(_RECONNECT_DELAY)
 
-        live_session._closed = True
-        logger.info(f"Run loop ended for {stream_sid}")
+                except Exception as e:
+                    record = self._records.get(stream_sid)
+                    if record is None or record.stop.is_set():
+                        break
+                    logger.warning(
+                        f"Session error for {stream_sid}: {e} — "
+                        f"reconnecting in {delay:.1f}s..."
+                    )
+                    if successor is None:
+                        live_session._session = None
+
+                finally:
+                    self._lanes.release()
+
+                if successor is not None:
+                    # GoAway cutover: the replacement is already open and sends
+                    # moved over, so skip the backoff and adopt it right away
+                    logger.info(f"Adopting preopened successor for {stream_sid}")
+                    continue
+
+                if live_session._parked:
+                    # Sleep with no connection (and no lane) until the caller
+                    # speaks again, then resume on the saved handle right away
+                    await live_session._activity.wait()
+                    live_session._activity.clear()
+                    live_session._parked = False
+                    logger.info(f"Unparking session for {stream_sid}, resuming")
+                    continue
+
+                # Jitter spreads concurrent reconnects so a Vertex blip doesn't
+                # come back as a thundering herd
+                await asyncio.sleep(delay * (0.8 + 0.4 * random.random()))
+                delay = min(delay * 2, _RECONNECT_DELAY_MAX)
+
+        finally:
+            if successor_task is not None:
+                successor_task.cancel()
+            if successor is not None:
+                # Ending with a successor still un-adopted: close it too
+                cm, _ = successor
+                try:
+                    await cm.__aexit__(None, None, None)
+                except Exception:
+                    pass
+
+            if flush_handle is not None:
+                flush_handle.cancel()
+            live_session._signal_close()
+            sender_task.cancel()
+            try:
+                await sender_task
+            except asyncio.CancelledError:
+                pass
+            logger.info(f"Run loop ended for {stream_sid}")
 
     async def _cleanup(self, stream_sid: str):
         """Clean up session resources"""
-        task = self._run_tasks.pop(stream_sid, None)
-        if task and not task.done():
-            task.cancel()
+        record = self._records.pop(stream_sid, None)
+        if record is None:
+            return
+
+        # Stop first, then cancel: the run task may be inside except/finally
+        # where CancelledError doesn't land, and the event makes the stop
+        # unambiguous either way
+        record.stop.set()
+
+        if record.task and not record.task.done():
+            record.task.cancel()
             try:
-                await task
+                await record.task
             except asyncio.CancelledError:
                 pass
 
-        session = self.active_sessions.pop(stream_sid, None)
-        if session:
-            session._closed = True
+        record.session._signal_close()
 
-        self.ready_events.pop(stream_sid, None)
+        # Grace-period delete: a racing reconnect for the same stream can
+        # still pick the handle up before it goes
+        self._resumption_store.delete_later(stream_sid)
 
 
 # Global service instance